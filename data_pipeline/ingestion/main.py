@@ -1,14 +1,157 @@
 import os
+import io
+import time
+import tempfile
+import functools
 import logging
+import threading
+from collections.abc import Iterator
+from typing import BinaryIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 import yaml
 
-import requests
-import json
+import httpx
+from requests.adapters import HTTPAdapter
+import orjson
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 
+# IGDB allows 4 requests per second and at most 8 open requests at a time.
+REQUESTS_PER_SECOND = 4
+MAX_OPEN_REQUESTS = 8
+ROW_INTERVAL = 500      # Max rows per request is 500
+MULTIQUERY_URL = "https://api.igdb.com/v4/multiquery"
+MAX_MULTIQUERIES = 10   # Max queries per multiquery request is 10
+MAX_RETRIES = 5         # Retries of rate limited or failed requests
+RETRY_BACKOFF = 0.5     # Seconds before the first retry, doubled for every retry after
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+UPLOAD_CHUNK_ROWS = 50_000  # Max rows per BigQuery load job when uploading a DataFrame
+# Parse YAML with libyaml's C loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# pandas dtypes for BigQuery column types, nullable so missing values are kept as <NA>
+PANDAS_DTYPES = {"INTEGER": "Int64", "FLOAT": "float64", "STRING": "string[pyarrow]", "BOOLEAN": "boolean"}
+# Arrow element types for REPEATED BigQuery columns
+ARROW_TYPES = {"INTEGER": pa.int64(), "FLOAT": pa.float64(), "STRING": pa.string(), "BOOLEAN": pa.bool_()}
+
+
+@functools.lru_cache(maxsize=1)
+def get_bq_client() -> bigquery.Client:
+    """
+    Returns a BigQuery client shared across the process, so credential discovery
+    and connection setup only happen once.
+
+    Returns:
+        bigquery.Client: The shared BigQuery client.
+    """
+    credentials, project = google.auth.default(scopes=bigquery.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+    return bigquery.Client(project=project, credentials=credentials, _http=session)
+
+
+@functools.lru_cache(maxsize=1)
+def load_config() -> dict:
+    """
+    Loads value_config.yml. The file is only parsed on the first call, later
+    calls (e.g. warm invocations of the container) reuse the parsed config.
+
+    Returns:
+        dict: The parsed config.
+    """
+    with open("value_config.yml", "r") as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
+
+@functools.lru_cache(maxsize=1)
+def env_table_ids() -> tuple[str, ...]:
+    """
+    Returns the BigQuery table IDs from the BQ_TABLE_IDS environment variable.
+
+    Returns:
+        tuple[str, ...]: The table IDs.
+    """
+    return tuple(os.getenv("BQ_TABLE_IDS", "").split(","))
+
+
+def parse_query(query: str) -> dict[str, str]:
+    """
+    Splits an IGDB API query into its clauses. Only the clause keywords are
+    lowercased, so string literals in e.g. where clauses keep their case.
+
+    Args:
+        query (str): The query, e.g. "fields name; sort id asc;".
+
+    Returns:
+        A dictionary mapping each clause keyword to its value, e.g.
+        {"fields": "name", "sort": "id asc"}.
+    """
+    return {sub_seg[0].lower(): sub_seg[1].strip() for sub_seg in [seg.strip().split(maxsplit=1) for seg in query.split(";")[:-1]]}
+
+
+def field_order(query: str) -> list[str] | None:
+    """
+    Returns the columns returned for an IGDB API query, in the order of its
+    fields clause. IGDB always returns the id, and expanded fields such as 
+    "genres.name" are returned nested under their first part.
+
+    Args:
+        query (str): The query, e.g. "fields name, genres.name; sort id asc;".
+
+    Returns:
+        The column names, e.g. ["id", "name", "genres"], or None if the query 
+        has no fields clause or selects all fields.
+    """
+    fields = parse_query(query).get("fields")
+    if fields is None:
+        return None
+    columns = ["id"] + [field.strip().split(".", 1)[0] for field in fields.split(",")]
+    if "*" in columns:
+        return None
+    return list(dict.fromkeys(columns))
+
+
+def arrow_to_pandas_dtype(arrow_type: pa.DataType) -> pd.api.extensions.ExtensionDtype | None:
+    """
+    Maps an Arrow type read from Parquet to the pandas dtype `Data.coerce_dtypes`
+    casts it to, so saved tables load back with the dtypes they were saved with.
+
+    Args:
+        arrow_type (pa.DataType): The Arrow type of a column.
+
+    Returns:
+        The pandas dtype, or None to use the default conversion.
+    """
+    if pa.types.is_list(arrow_type):
+        # Parquet names the list items "element", cast back so the dtype matches fetched data
+        return pd.ArrowDtype(pa.list_(arrow_type.value_type))
+    if pa.types.is_int64(arrow_type):
+        return pd.Int64Dtype()
+    if pa.types.is_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    if pa.types.is_boolean(arrow_type):
+        return pd.BooleanDtype()
+    return None
+
+
+def read_parquet(file_path: str) -> pd.DataFrame:
+    """
+    Reads a Parquet file into a DataFrame. The pandas metadata in the file is
+    ignored, since pandas can't restore Arrow list dtypes from it.
+
+    Args:
+        file_path (str): The path to the Parquet file.
+
+    Returns:
+        The data in the file.
+    """
+    return pq.read_table(file_path).to_pandas(ignore_metadata=True, types_mapper=arrow_to_pandas_dtype)
+
 
 class Data:
     def __init__(self, data: pd.DataFrame | None = None) -> None:
@@ -26,6 +169,8 @@ class Data:
         return f"Data(data={self.data})"
     def __str__(self):
         return str(self.data)
+    def __bool__(self) -> bool:
+        return self._nrows > 0
     
     @property
     def data(self) -> pd.DataFrame:
@@ -47,6 +192,8 @@ class Data:
         if not isinstance(value, pd.DataFrame):
             raise TypeError("Data must be a list")
         self._data = value
+        # Cached so records and truthiness checks don't touch the frame
+        self._nrows = len(value)
     
     @property
     def records(self) -> int:
@@ -56,7 +203,7 @@ class Data:
         Returns:
             int: The number of records.
         """
-        return self.data.shape[0]
+        return self._nrows
     
     def save_to_json(self, file_path: str, append: bool = False, exclude_duplicates: bool = True) -> None:
         """
@@ -69,18 +216,18 @@ class Data:
         """
         try:
             if append:
-                with open(file_path, "r") as f:
-                    existing_data = pd.DataFrame(json.load(f))
-                with open(file_path, "w") as f:
-                    if exclude_duplicates:
-                        combined_data = pd.concat([existing_data, self.data]).drop_duplicates(subset=['id'])
-                        json.dump(combined_data.to_dict(orient='records'), f, indent=4)
-                    else:
-                        combined_data = pd.concat([existing_data, self.data])
-                        json.dump(combined_data.to_dict(orient='records'), f, indent=4)
+                with open(file_path, "rb") as f:
+                    existing_data = orjson.loads(f.read())
+                new_data = self.data
+                if exclude_duplicates:
+                    # Only the new records need checking against the existing IDs
+                    existing_ids = {record["id"] for record in existing_data}
+                    new_data = new_data[~new_data["id"].isin(existing_ids)]
+                with open(file_path, "wb") as f:
+                    f.write(orjson.dumps(existing_data + new_data.to_dict(orient='records'), option=orjson.OPT_SERIALIZE_NUMPY))
             else:
-                with open(file_path, "w") as f:
-                    json.dump(self.data.to_dict(orient='records'), f, indent=4)
+                # Let pandas' C writer serialize the frame without building a list of dicts
+                self.data.to_json(file_path, orient='records', double_precision=15)
             logging.info(f"Data successfully saved to {file_path}. Added {len(self.data)} records.")
         except Exception as e:
             logging.error(f"Error saving data to JSON: {e}")
@@ -93,12 +240,69 @@ class Data:
             file_path (str): The path to the JSON file to load data from.
         """
         try:
-            with open(file_path, "r") as f:
-                self.data = pd.DataFrame(json.load(f))
+            with open(file_path, "rb") as f:
+                self.data = pd.DataFrame(orjson.loads(f.read()))
             logging.info(f"Data successfully loaded from {file_path}")
         except Exception as e:
             logging.error(f"Error loading data from JSON: {e}")
             raise
+    def save_to_parquet(self, file_path: str, append: bool = False, exclude_duplicates: bool = True) -> None:
+        """
+        Saves `data` to a Zstandard compressed Parquet file.
+
+        Args:
+            file_path (str): The path to the file where `data` should be saved.
+            append (bool): If True, appends to data in existing file. Defaults to False.
+            exclude_duplicates (bool): If True, excludes records with duplicate IDs. Defaults to True.
+        """
+        try:
+            if append:
+                existing_data = read_parquet(file_path)
+                new_data = self.data
+                if exclude_duplicates:
+                    # Hash only the id columns instead of scanning the combined frame
+                    new_data = new_data[~new_data['id'].isin(existing_data['id'])]
+                combined_data = pd.concat([existing_data, new_data], ignore_index=True)
+            else:
+                combined_data = self.data
+            pq.write_table(pa.Table.from_pandas(combined_data, preserve_index=False), file_path, 
+                           compression="zstd", compression_level=3)
+            logging.info(f"Data successfully saved to {file_path}. Added {len(self.data)} records.")
+        except Exception as e:
+            logging.error(f"Error saving data to Parquet: {e}")
+            raise
+    def coerce_dtypes(self, dtypes: dict[str, str | pd.api.extensions.ExtensionDtype]) -> None:
+        """
+        Casts the columns of `data` to the given dtypes. Columns that are missing
+        from `data` are skipped.
+
+        Args:
+            dtypes (dict[str, str | ExtensionDtype]): A dictionary mapping column 
+                names to dtypes.
+        """
+        dtypes = {column: dtype for column, dtype in dtypes.items() 
+                  if column in self.data.columns and self.data[column].dtype != dtype}
+        # A list field missing from every record is an all-NaN float column, which
+        # Arrow can't convert to a list, so list columns are cast from objects
+        list_columns = {column: object for column, dtype in dtypes.items() if isinstance(dtype, pd.ArrowDtype)}
+        try:
+            self.data = self.data.astype(list_columns).astype(dtypes)
+        except Exception as e:
+            logging.error(f"Error casting data types: {e}")
+            raise
+    def load_from_parquet(self, file_path: str) -> None:
+        """
+        Loads data from a Parquet file into the instance variable `data`.
+
+        Args:
+            file_path (str): The path to the Parquet file to load data from.
+        """
+        try:
+            self.data = read_parquet(file_path)
+            logging.info(f"Data successfully loaded from {file_path}")
+        except Exception as e:
+            logging.error(f"Error loading data from Parquet: {e}")
+            raise
     def clear_data(self) -> None:
         """
         Clears the current data stored in the instance variable `data`.
@@ -107,11 +311,18 @@ class Data:
         logging.info("Data cleared")
 
 class Pipeline:
-    def __init__(self) -> None:
+    def __init__(self, client: bigquery.Client | None = None, 
+                 transport: httpx.BaseTransport | None = None) -> None:
         """
         Creates an instance of APIData to handle authentication and data fetching 
         from the IGDB API.
 
+        Args:
+            client (bigquery.Client | None): Optional BigQuery client, defaults to 
+                the shared client.
+            transport (httpx.BaseTransport | None): Optional transport for the 
+                IGDB and Twitch requests, e.g. to mock the APIs.
+
         Attributes:
             TOKEN_URL (str): The URL for obtaining OAuth2 tokens from Twitch.
             api_url (str): The URL for the IGDB API last fetched from.
@@ -119,15 +330,162 @@ class Pipeline:
         """
         logging.info("Authenticating BigQuery client")
         try:
-            self.client = bigquery.Client()
+            self.client = client if client is not None else get_bq_client()
             logging.info("Authentication successful")
         except Exception as e:
             logging.error(f"An error occurd when trying to authenticate: {e}")
             raise
+        self.schemas = self._load_schemas("schemas")
         self.TOKEN_URL = "https://id.twitch.tv/oauth2/token"
+        self.TOKEN_CACHE_PATH = os.path.expanduser("~/.cache/igdb_token.json")
         self.auth = None
+        # Kept so an expired or revoked token can be replaced mid-run
+        self._credentials = None
+        self._auth_lock = threading.Lock()
+        # Every token this pipeline has used, callers may still hold a replaced one
+        self._own_tokens = set()
+
+        # Reuse connections across requests instead of a new TCP+TLS handshake per call.
+        # With HTTP/2 the concurrent page requests are multiplexed over one connection.
+        self.session = httpx.Client(http2=True, timeout=30.0, transport=transport, 
+                                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16))
+        self._request_slots = threading.BoundedSemaphore(MAX_OPEN_REQUESTS)
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+    def _load_schemas(self, directory: str) -> dict[str, list[bigquery.SchemaField]]:
+        """
+        Loads the BigQuery schema of each table from `{directory}/{table_id}.json`.
+
+        Args:
+            directory (str): The directory containing the schema files.
+
+        Returns:
+            A dictionary mapping table IDs to their schemas.
+        """
+        schemas = {}
+        if not os.path.isdir(directory):
+            logging.info(f"No schema directory found at {directory}, schemas will be autodetected")
+            return schemas
+        for file_name in os.listdir(directory):
+            table_id, extension = os.path.splitext(file_name)
+            if extension == ".json":
+                schemas[table_id] = self.client.schema_from_json(os.path.join(directory, file_name))
+        logging.info(f"Loaded BigQuery schemas for {', '.join(sorted(schemas))}")
+        return schemas
+
+    def column_dtypes(self, table_id: str) -> dict[str, str | pd.api.extensions.ExtensionDtype]:
+        """
+        Returns the pandas dtypes matching the BigQuery schema of a table. Nullable
+        and Arrow backed dtypes are used so missing values don't turn integer 
+        columns into floats and lists aren't kept as Python objects.
+
+        Args:
+            table_id (str): The BigQuery table ID.
+
+        Returns:
+            A dictionary mapping column names to dtypes, empty if the table has 
+            no schema.
+        """
+        dtypes = {}
+        for field in self.schemas.get(table_id, []):
+            if field.mode == "REPEATED" and field.field_type in ARROW_TYPES:
+                dtypes[field.name] = pd.ArrowDtype(pa.list_(ARROW_TYPES[field.field_type]))
+            elif field.field_type in PANDAS_DTYPES:
+                dtypes[field.name] = PANDAS_DTYPES[field.field_type]
+        return dtypes
+
+    def _post(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a POST request to the IGDB API through the shared session while
+        staying within the API rate limits. Rate limited or failed requests are
+        retried with backoff, IGDB queries are read-only so retrying POST is safe.
+        If the access token is rejected, a new one is requested and the request
+        is retried once. Safe to call from multiple threads.
+
+        Args:
+            url (str): The URL to post to.
+            **kwargs: Keyword arguments passed on to `httpx.Client.post`.
+
+        Returns:
+            The response from the API.
+
+        Raises:
+            httpx.HTTPStatusError: If the API still returns an error after retrying.
+        """
+        response = self._send(url, **kwargs)
+        if response.status_code == 401 and self._credentials is not None:
+            sent_authorization = response.request.headers.get("Authorization")
+            with self._auth_lock:
+                # Another thread may already have replaced the rejected token
+                if sent_authorization == f"Bearer {self.auth['access_token']}":
+                    logging.info("Access token was rejected, authenticating again")
+                    self.authenticate(*self._credentials, use_cache=False)
+            if "Authorization" in kwargs.get("headers", {}):
+                kwargs["headers"] = {**kwargs["headers"], "Authorization": f"Bearer {self.auth['access_token']}"}
+            response = self._send(url, **kwargs)
+        # Keep error bodies from being parsed as records
+        response.raise_for_status()
+        return response
+
+    def _auth_headers(self, client_id: str, access_token: str) -> dict[str, str]:
+        """
+        Returns the IGDB API credential headers to send with a request. They are
+        left to the session defaults when the token is or was the pipeline's own, 
+        so a replaced token is never sent again, even by callers still holding it.
+
+        Args:
+            client_id (str): The client ID from Twitch Developer for the IGDB API.
+            access_token (str): The access token obtained from authentication.
+
+        Returns:
+            The headers, empty if the session defaults apply.
+        """
+        if access_token in self._own_tokens and self.session.headers.get("Client-ID") == client_id:
+            return {}
+        return {"Client-ID": client_id, "Authorization": f"Bearer {access_token}"}
+
+    def _send(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a POST request like `_post`, without replacing rejected tokens or
+        raising for error responses.
+
+        Args:
+            url (str): The URL to post to.
+            **kwargs: Keyword arguments passed on to `httpx.Client.post`.
+
+        Returns:
+            The response from the API.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            delay = RETRY_BACKOFF * 2 ** attempt
+            with self._request_slots:
+                with self._rate_lock:
+                    now = time.monotonic()
+                    if self._next_request_at > now:
+                        time.sleep(self._next_request_at - now)
+                    self._next_request_at = max(now, self._next_request_at) + 1 / REQUESTS_PER_SECOND
+                try:
+                    response = self.session.post(url, **kwargs)
+                except httpx.TransportError as e:
+                    if attempt == MAX_RETRIES:
+                        raise
+                    error = e
+                    response = None
+            # Back off outside the request slot so other requests can use it meanwhile
+            if response is None:
+                logging.info(f"Request to {url} failed ({error}), retrying in {delay} seconds")
+                time.sleep(delay)
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            logging.info(f"Request to {url} returned {response.status_code}, retrying in {delay} seconds")
+            time.sleep(delay)
     
-    def authenticate(self, client_id: str, client_secret: str) -> None:
+    def authenticate(self, client_id: str, client_secret: str, use_cache: bool = True) -> None:
         """
         Tries to authenticate with the IGDB API using the provided client ID 
         and client secret.
@@ -136,14 +494,23 @@ class Pipeline:
             client_id (str): The client ID from Twitch Developer for the IGDB API.
             client_secret (str): The client secret from Twitch Developer for the 
                 IGDB API.
+            use_cache (bool): If True, reuses a cached access token that has not 
+                expired. Defaults to True.
 
         Returns:
             Authentication data if successful, otherwise returns None.
         """
         logging.info("Authenticating IGDB API access")
+        self._credentials = (client_id, client_secret)
+        cached_auth = self._load_cached_token(client_id) if use_cache else None
+        if cached_auth:
+            logging.info("Using cached access token")
+            self.auth = cached_auth
+            self._set_session_headers(client_id)
+            return
         try:
             # Make the authentication request
-            response = requests.post(
+            response = self.session.post(
                 url=self.TOKEN_URL,
                 params={
                     "client_id": client_id,
@@ -159,9 +526,71 @@ class Pipeline:
         except Exception as e:
             logging.error(f"An error occurd when trying to authenticate: {e}")
             raise
+        self._set_session_headers(client_id)
+        self._save_cached_token(client_id, auth_data)
+
+    def _set_session_headers(self, client_id: str) -> None:
+        """
+        Sets the IGDB API credentials as default headers on the session.
+
+        Args:
+            client_id (str): The client ID from Twitch Developer for the IGDB API.
+        """
+        self.session.headers.update({"Client-ID": client_id, 
+                                     "Authorization": f"Bearer {self.auth['access_token']}"})
+        self._own_tokens.add(self.auth["access_token"])
+
+    def _load_cached_token(self, client_id: str) -> dict | None:
+        """
+        Loads the cached access token for `client_id` if it has not expired.
+
+        Args:
+            client_id (str): The client ID the token was issued for.
+
+        Returns:
+            The cached authentication data if valid, otherwise returns None.
+        """
+        try:
+            with open(self.TOKEN_CACHE_PATH, "rb") as f:
+                cached_auth = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        if cached_auth.get("client_id") != client_id or cached_auth.get("expires_at", 0) <= time.time():
+            return None
+        return cached_auth
+
+    def _save_cached_token(self, client_id: str, auth_data: dict) -> None:
+        """
+        Caches an access token on disk so later runs can skip authentication.
+        The token is treated as expired one minute before Twitch expires it. The
+        cache file is replaced atomically, so readers never see a partial write.
+
+        Args:
+            client_id (str): The client ID the token was issued for.
+            auth_data (dict): The authentication data returned by Twitch.
+        """
+        cached_auth = {
+            "client_id": client_id,
+            "access_token": auth_data["access_token"],
+            "expires_at": time.time() + auth_data.get("expires_in", 0) - 60,
+        }
+        try:
+            cache_dir = os.path.dirname(self.TOKEN_CACHE_PATH)
+            os.makedirs(cache_dir, exist_ok=True)
+            # mkstemp creates the file readable by the owner only
+            fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(orjson.dumps(cached_auth))
+                os.replace(temp_path, self.TOKEN_CACHE_PATH)
+            except OSError:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            logging.warning(f"Could not cache access token: {e}")
 
-    def api_fetch(self, url: str, client_id: str, access_token: str, 
-                  query: str) -> pd.DataFrame | None:
+    def api_fetch(self, url: str, client_id: str, access_token: str, query: str, 
+                  first_page: list[dict] | None = None, count: int | None = None) -> pd.DataFrame | None:
         """
         Fetches data from the IGDB API using the provided URL,
         client ID, access token, and optional data fields and limit.  
@@ -179,75 +608,485 @@ class Pipeline:
                 False.
             ignore_existing_ids (bool): If True, ignores records with IDs that already 
                 are in `data`. Defaults to True.
+            first_page (list[dict] | None): Optional first page of records, if it 
+                was already fetched, e.g. by `api_multifetch_pages`.
+            count (int | None): Optional number of records matching the query, if 
+                already known.
 
         Returns:
             The fetched data if successful, otherwise returns None.
         """
         logging.info("Fetching data")
         try:
-            query_properties = {sub_seg[0].strip(): sub_seg[1].strip() for sub_seg in [seg.strip().split(maxsplit=1) for seg in query.lower().split(";")[:-1]]}
-            ROW_INTERVAL = 500      # Max rows per request is 500
-            if "limit" in query_properties.keys():
-                query_limit = int(query_properties["limit"])
-            else:
-                query_limit = None
-
-            offset = 0
-            all_data = pd.DataFrame()
-            paged_query_properties = query_properties.copy()
-            reached_end = False
-            while not reached_end:
-                if query_limit and offset + ROW_INTERVAL >= query_limit:
-                    paged_query_properties["limit"] = str(query_limit - offset)
-                else:
-                    paged_query_properties["limit"] = str(ROW_INTERVAL)
-                paged_query_properties["offset"] = str(offset)
-                paged_query = " ".join([f"{key} {value};" for key, value in paged_query_properties.items()])
-                response = requests.post(url=url, 
-                                         headers={"Client-ID": client_id, 
-                                                  "Authorization": f"Bearer {access_token}"}, 
-                                         data=paged_query).json()
-                data_chunk = pd.DataFrame(response)
-                all_data = pd.concat([all_data, data_chunk], ignore_index=True)
-                offset += ROW_INTERVAL
-                if len(data_chunk) < ROW_INTERVAL:
-                    reached_end = True
+            # Collect the raw records and build the DataFrame once at the end
+            records = [record for page in self._fetch_pages(url, client_id, access_token, query, first_page, count) 
+                       for record in page]
+            # Known columns spare pandas from collecting the keys of every record
+            all_data = pd.DataFrame.from_records(records, columns=field_order(query))
             logging.info(f"Data fetch successful from {url}. Fetched {len(all_data)} records.")
             return all_data
         except Exception as e:
             logging.error(f"An error occurd when trying to fetch data: {e}")
             raise
-    
-    def upload_to_bigquery(self, data: Data, dataset_id: str, table_id: str) -> None:
+
+    def api_fetch_ndjson(self, url: str, client_id: str, access_token: str, 
+                         query: str, file_path: str) -> int:
         """
-        Uploads the `data` to a specified BigQuery table.
+        Fetches data from the IGDB API like `api_fetch`, but writes the raw records
+        to a newline-delimited JSON file as the pages arrive instead of building a
+        DataFrame.
+
+        Args:
+            url (str): The IGDB API endpoint URL. (Should be in the format
+                "https://api.igdb.com/v4/{endpoint}")
+            client_id (str): The client ID from Twitch Developer for the IGDB API.
+            access_token (str): The access token obtained from authentication.
+            query (str): The query for the IGDB API.
+            file_path (str): The path to the file where the records should be saved.
+
+        Returns:
+            The number of records fetched.
+        """
+        logging.info("Fetching data")
+        try:
+            records = 0
+            with open(file_path, "wb") as f:
+                for page in self._fetch_pages(url, client_id, access_token, query):
+                    f.write(b"".join(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in page))
+                    records += len(page)
+            logging.info(f"Data fetch successful from {url}. Saved {records} records to {file_path}.")
+            return records
+        except Exception as e:
+            logging.error(f"An error occurd when trying to fetch data: {e}")
+            raise
+
+    def _fetch_pages(self, url: str, client_id: str, access_token: str, query: str, 
+                     first_page: list[dict] | None = None, count: int | None = None) -> Iterator[list[dict]]:
+        """
+        Fetches every page of records matching `query` from the IGDB API. The
+        pages are requested concurrently but yielded in order.
+
+        Args:
+            url (str): The IGDB API endpoint URL.
+            client_id (str): The client ID from Twitch Developer for the IGDB API.
+            access_token (str): The access token obtained from authentication.
+            query (str): The query for the IGDB API.
+            first_page (list[dict] | None): Optional first page of records, which is
+                yielded instead of being fetched again.
+            count (int | None): Optional number of records matching the query, if 
+                not given it is fetched from the count endpoint.
+
+        Returns:
+            An iterator of pages, each a list of records.
+        """
+        query_properties = parse_query(query)
+        if "limit" in query_properties.keys():
+            query_limit = int(query_properties["limit"])
+        else:
+            query_limit = None
+
+        headers = self._auth_headers(client_id, access_token)
+        if count is None:
+            # Count the matching records first so all pages can be requested at once
+            count_query = f"where {query_properties['where']};" if "where" in query_properties else ""
+            count = orjson.loads(self._post(url=f"{url.rstrip('/')}/count", headers=headers, 
+                                            content=count_query.encode()).content)["count"]
+        total = min(count, query_limit) if query_limit is not None else count
+
+        # Only limit and offset change between pages, so join the other clauses once
+        static_query = " ".join([f"{key} {value};" for key, value in query_properties.items() 
+                                 if key not in ("limit", "offset")])
+
+        def fetch_page(offset: int) -> list[dict]:
+            paged_query = f"{static_query} limit {min(ROW_INTERVAL, total - offset)}; offset {offset};"
+            # Decode the payload with orjson's C parser instead of httpx's json()
+            return orjson.loads(self._post(url=url, headers=headers, 
+                                           content=paged_query.encode()).content)
+
+        start = 0
+        if first_page is not None:
+            yield first_page
+            start = len(first_page)
+        # Pages are fetched concurrently, `_post` keeps them within the rate limits
+        with ThreadPoolExecutor(max_workers=MAX_OPEN_REQUESTS) as executor:
+            yield from executor.map(fetch_page, range(start, total, ROW_INTERVAL))
+
+    def api_multifetch(self, client_id: str, access_token: str, 
+                       queries: dict[str, tuple[str, str]]) -> dict[str, pd.DataFrame]:
+        """
+        Fetches the first page of several queries from the IGDB API using the 
+        multiquery endpoint, sending up to 10 queries per request.
+
+        Args:
+            client_id (str): The client ID from Twitch Developer for the IGDB API.
+            access_token (str): The access token obtained from authentication.
+            queries (dict[str, tuple[str, str]]): A dictionary mapping a unique 
+                result name to a tuple of the IGDB API endpoint URL and its query.
+                The limit of each query is capped at 500 records.
+
+        Returns:
+            A dictionary mapping each result name to its fetched data.
+        """
+        logging.info("Fetching data with multiquery")
+        try:
+            results = self._multiquery(client_id, access_token, queries, counts=False)
+            # Known columns spare pandas from collecting the keys of every record
+            all_data = {name: pd.DataFrame.from_records(records, columns=field_order(queries[name][1])) 
+                        for name, (records, _) in results.items()}
+            logging.info(f"Multiquery fetch successful. Fetched {len(all_data)} results.")
+            return all_data
+        except Exception as e:
+            logging.error(f"An error occurd when trying to fetch data: {e}")
+            raise
+
+    def api_multifetch_pages(self, client_id: str, access_token: str, 
+                             queries: dict[str, tuple[str, str]]) -> dict[str, tuple[list[dict], int]]:
+        """
+        Fetches the first page of records of several queries, and the number of
+        records matching each query, from the IGDB API using the multiquery 
+        endpoint. The results can be passed on to `api_fetch` to fetch the 
+        remaining pages without requesting the first page or the count again.
+
+        Args:
+            client_id (str): The client ID from Twitch Developer for the IGDB API.
+            access_token (str): The access token obtained from authentication.
+            queries (dict[str, tuple[str, str]]): A dictionary mapping a unique 
+                result name to a tuple of the IGDB API endpoint URL and its query.
+                The limit of each query is capped at 500 records.
+
+        Returns:
+            A dictionary mapping each result name to its first page of records and
+            the number of records matching the query.
+        """
+        logging.info("Fetching first pages with multiquery")
+        try:
+            results = self._multiquery(client_id, access_token, queries, counts=True)
+            logging.info(f"Multiquery fetch successful. Fetched {len(results)} results.")
+            return results
+        except Exception as e:
+            logging.error(f"An error occurd when trying to fetch data: {e}")
+            raise
+
+    def _multiquery(self, client_id: str, access_token: str, queries: dict[str, tuple[str, str]], 
+                    counts: bool) -> dict[str, tuple[list[dict], int | None]]:
+        """
+        Sends the first page of several queries to the multiquery endpoint, up to
+        10 sub-queries per request.
+
+        Args:
+            client_id (str): The client ID from Twitch Developer for the IGDB API.
+            access_token (str): The access token obtained from authentication.
+            queries (dict[str, tuple[str, str]]): A dictionary mapping a unique 
+                result name to a tuple of the IGDB API endpoint URL and its query.
+            counts (bool): If True, the number of records matching each query is 
+                fetched in the same requests.
+
+        Returns:
+            A dictionary mapping each result name to its first page of records and
+            the number of matching records, which is None if `counts` is False.
+        """
+        sub_queries = []
+        for name, (url, query) in queries.items():
+            endpoint = url.rstrip("/").rsplit("/", 1)[-1]
+            query_properties = parse_query(query)
+            query_properties["limit"] = str(min(int(query_properties.get("limit", ROW_INTERVAL)), ROW_INTERVAL))
+            query_properties.pop("offset", None)
+            body = " ".join([f"{key} {value};" for key, value in query_properties.items()])
+            sub_queries.append(f'query {endpoint} "{name}" {{ {body} }};')
+            if counts:
+                count_body = f"where {query_properties['where']};" if "where" in query_properties else ""
+                sub_queries.append(f'query {endpoint}/count "{name} count" {{ {count_body} }};')
+
+        headers = self._auth_headers(client_id, access_token)
+        records = {}
+        record_counts = {}
+        for i in range(0, len(sub_queries), MAX_MULTIQUERIES):
+            body = " ".join(sub_queries[i:i + MAX_MULTIQUERIES]).encode()
+            response = orjson.loads(self._post(url=MULTIQUERY_URL, headers=headers, content=body).content)
+            for result in response:
+                if "count" in result:
+                    record_counts[result["name"].removesuffix(" count")] = result["count"]
+                else:
+                    records[result["name"]] = result["result"]
+        return {name: (records[name], record_counts.get(name)) for name in queries}
+
+    def upload_to_bigquery(self, data: Data | str, dataset_id: str, table_id: str, 
+                           wait: bool = True) -> list[bigquery.LoadJob]:
+        """
+        Uploads the `data` to a specified BigQuery table. Data is cast to the
+        dtypes of the table's schema first. Data with more than UPLOAD_CHUNK_ROWS 
+        rows is uploaded in chunks, one load job per chunk, so only one chunk is 
+        serialized in memory at a time.
+
+        Args:
+            data (Data | str): The data to upload, or the path to a local Parquet 
+                file to upload as it is if its column types match the schema.
+            dataset_id (str): The BigQuery data set ID.
+            table_id (str): The BigQuery table ID.
+            wait (bool): If True, waits for the load jobs to complete. Defaults to True.
+
+        Returns:
+            The BigQuery load jobs.
+        """
+        table_ref = self.client.dataset(dataset_id).table(table_id)
+        try:
+            logging.info("Starting BigQuery upload...")
+            job_config = self._parquet_job_config(table_id, bigquery.WriteDisposition.WRITE_TRUNCATE)
+            if isinstance(data, str) and not self._parquet_matches_schema(data, table_id):
+                # E.g. files saved before columns were cast, with floats for nullable ints
+                logging.info(f"Column types in {data} don't match the schema, casting before upload")
+                file_path, data = data, Data()
+                data.load_from_parquet(file_path)
+            if not isinstance(data, str):
+                # Cast a copy so a schema is never attached to mismatching columns
+                data = Data(data.data)
+                data.coerce_dtypes(self.column_dtypes(table_id))
+            if isinstance(data, str):
+                # Upload the Parquet file directly, no need to load it into a DataFrame
+                with open(data, "rb") as f:
+                    jobs = [self.client.load_table_from_file(f, table_ref, job_config=job_config)]
+            else:
+                # Slicing the Arrow table is zero-copy, only the chunk being uploaded is serialized
+                table = pa.Table.from_pandas(data.data, preserve_index=False)
+                jobs = [self._upload_parquet_chunk(table.slice(0, UPLOAD_CHUNK_ROWS), table_ref, job_config)]
+                if table.num_rows > UPLOAD_CHUNK_ROWS:
+                    # The truncating load has to finish before any chunk is appended
+                    jobs[0].result()
+                    job_config = self._parquet_job_config(table_id, bigquery.WriteDisposition.WRITE_APPEND)
+                    for offset in range(UPLOAD_CHUNK_ROWS, table.num_rows, UPLOAD_CHUNK_ROWS):
+                        jobs.append(self._upload_parquet_chunk(table.slice(offset, UPLOAD_CHUNK_ROWS), 
+                                                               table_ref, job_config))
+        except Exception as e:
+            logging.error(f"Error uploading to BigQuery: {e}")
+            raise
+        if wait:
+            self.wait_for_upload(jobs)
+        return jobs
+
+    def _parquet_matches_schema(self, file_path: str, table_id: str) -> bool:
+        """
+        Checks that the column types of a Parquet file match the BigQuery schema
+        of a table. Only the file footer is read.
+
+        Args:
+            file_path (str): The path to the Parquet file.
+            table_id (str): The BigQuery table ID.
+
+        Returns:
+            True if every column in the schema has the expected type, or is 
+            missing from the file.
+        """
+        file_schema = pq.read_schema(file_path)
+        for field in self.schemas.get(table_id, []):
+            if field.name not in file_schema.names or field.field_type not in ARROW_TYPES:
+                continue
+            arrow_type = file_schema.field(field.name).type
+            if field.mode == "REPEATED":
+                if not pa.types.is_list(arrow_type):
+                    return False
+                arrow_type = arrow_type.value_type
+            if arrow_type != ARROW_TYPES[field.field_type]:
+                return False
+        return True
+
+    def _parquet_job_config(self, table_id: str, write_disposition: str) -> bigquery.LoadJobConfig:
+        """
+        Creates the configuration of a Parquet load job.
+
+        Args:
+            table_id (str): The BigQuery table ID.
+            write_disposition (str): The write disposition of the load job.
+
+        Returns:
+            The load job configuration.
+        """
+        parquet_options = bigquery.ParquetOptions()
+        parquet_options.enable_list_inference = True  # Load list columns as REPEATED
+        job_config = bigquery.LoadJobConfig(
+            write_disposition=write_disposition,
+            source_format=bigquery.SourceFormat.PARQUET,
+            parquet_options=parquet_options,
+        )
+        if table_id in self.schemas:
+            # A predefined schema keeps column types stable across loads
+            job_config.schema = self.schemas[table_id]
+        return job_config
+
+    def _upload_parquet_chunk(self, table: pa.Table, table_ref: bigquery.TableReference, 
+                              job_config: bigquery.LoadJobConfig) -> bigquery.LoadJob:
+        """
+        Serializes an Arrow table to an in-memory Parquet file and starts a load
+        job for it.
+
+        Args:
+            table (pa.Table): The rows to upload.
+            table_ref (bigquery.TableReference): The BigQuery table to load into.
+            job_config (bigquery.LoadJobConfig): The load job configuration.
+
+        Returns:
+            The BigQuery load job.
+        """
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer)
+        buffer.seek(0)
+        return self.client.load_table_from_file(buffer, table_ref, job_config=job_config)
+
+    def upload_json_to_bigquery(self, records: list[dict], dataset_id: str, table_id: str, 
+                                wait: bool = True) -> bigquery.LoadJob:
+        """
+        Uploads JSON records to a specified BigQuery table as newline-delimited
+        JSON, without converting them to a DataFrame first.
+
+        Args:
+            records (list[dict]): The records to upload.
+            dataset_id (str): The BigQuery data set ID.
+            table_id (str): The BigQuery table ID.
+            wait (bool): If True, waits for the load job to complete. Defaults to True.
+
+        Returns:
+            The BigQuery load job.
+        """
+        # Serialize to an in-memory newline-delimited JSON file
+        buffer = io.BytesIO(b"".join(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in records))
+        return self._upload_ndjson(buffer, dataset_id, table_id, wait)
+
+    def upload_ndjson_to_bigquery(self, file_path: str, dataset_id: str, table_id: str, 
+                                  wait: bool = True) -> bigquery.LoadJob:
+        """
+        Uploads a local newline-delimited JSON file to a specified BigQuery table
+        as it is, e.g. one written by `api_fetch_ndjson`.
+
+        Args:
+            file_path (str): The path to the newline-delimited JSON file.
+            dataset_id (str): The BigQuery data set ID.
+            table_id (str): The BigQuery table ID.
+            wait (bool): If True, waits for the load job to complete. Defaults to True.
+
+        Returns:
+            The BigQuery load job.
+        """
+        with open(file_path, "rb") as f:
+            return self._upload_ndjson(f, dataset_id, table_id, wait)
+
+    def _upload_ndjson(self, source: BinaryIO, dataset_id: str, table_id: str, 
+                       wait: bool) -> bigquery.LoadJob:
+        """
+        Uploads newline-delimited JSON from a file object to a specified BigQuery table.
+
+        Args:
+            source (BinaryIO): The file object to read the JSON from.
+            dataset_id (str): The BigQuery data set ID.
+            table_id (str): The BigQuery table ID.
+            wait (bool): If True, waits for the load job to complete.
+
+        Returns:
+            The BigQuery load job.
         """
         table_ref = self.client.dataset(dataset_id).table(table_id)
         try:
             # Configure load job
             job_config = bigquery.LoadJobConfig(
-                write_disposition="WRITE_TRUNCATE_DATA",
-                autodetect=False,  # Use predefined schema
+                write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
             )
-            
+            # Skip schema inference for tables with a predefined schema
+            if table_id in self.schemas:
+                job_config.schema = self.schemas[table_id]
+            else:
+                job_config.autodetect = True
+
             # Upload data
             logging.info("Starting BigQuery upload...")
-            job = self.client.load_table_from_dataframe(data.data, table_ref, job_config=job_config)
-            
+            job = self.client.load_table_from_file(source, table_ref, job_config=job_config)
+        except Exception as e:
+            logging.error(f"Error uploading to BigQuery: {e}")
+            raise
+        if wait:
+            self.wait_for_upload(job)
+        return job
+
+    def wait_for_upload(self, job: bigquery.LoadJob | list[bigquery.LoadJob]) -> None:
+        """
+        Waits for a BigQuery load job, or all load jobs of one table, to complete.
+
+        Args:
+            job (bigquery.LoadJob | list[bigquery.LoadJob]): The load job or jobs 
+                returned by one of the upload methods.
+        """
+        jobs = job if isinstance(job, list) else [job]
+        try:
             # Wait for completion
-            job.result()
-            
+            for load_job in jobs:
+                load_job.result()
+
             # Get updated table info
-            table = self.client.get_table(table_ref)
-            logging.info(f"Upload complete! Table now has {table.num_rows} total rows")
+            table = self.client.get_table(jobs[-1].destination)
+            logging.info(f"Upload complete! Table {table.table_id} now has {table.num_rows} total rows")
         except Exception as e:
             logging.error(f"Error uploading to BigQuery: {e}")
             raise
 
 
+def typed_data(pipeline: Pipeline, table_id: str, frame: pd.DataFrame) -> Data:
+    """
+    Wraps a fetched DataFrame in Data, with its columns cast to the dtypes of 
+    the table's BigQuery schema.
+
+    Args:
+        pipeline (Pipeline): An instance of the Pipeline class.
+        table_id (str): The BigQuery table ID.
+        frame (pd.DataFrame): The fetched data.
+
+    Returns:
+        The typed data.
+    """
+    data = Data(frame)
+    data.coerce_dtypes(pipeline.column_dtypes(table_id))
+    return data
+
+def fetch_tables(pipeline: Pipeline, client_id: str, urls: list[str], queries: list[str], 
+                 table_ids: list[str]) -> Iterator[tuple[str, Data]]:
+    """
+    Fetches data from several IGDB API endpoints. The first page and the record
+    count of every query are fetched in a single multiquery request, and only the
+    remaining pages of queries that need more than one page are fetched, 
+    concurrently.
+
+    Args:
+        pipeline (Pipeline): An instance of the Pipeline class.
+        client_id (str): The client ID for IGDB API authentication.
+        urls (list[str]): List of IGDB API endpoint URLs.
+        queries (list[str]): List of queries for the IGDB API, one per URL.
+        table_ids (list[str]): List of table IDs, one per URL.
+
+    Returns:
+        An iterator of table ID and Data tuples, in the order the tables finish
+        fetching, so callers can process each table as soon as it is ready.
+    """
+    first_pages = pipeline.api_multifetch_pages(client_id, pipeline.auth["access_token"], 
+                                                {table_id: (url, query) for url, query, table_id in zip(urls, queries, table_ids)})
+    with ThreadPoolExecutor(max_workers=MAX_OPEN_REQUESTS) as executor:
+        futures = {}
+        completed = []
+        for url, query, table_id in zip(urls, queries, table_ids):
+            first_page, count = first_pages[table_id]
+            query_limit = int(parse_query(query).get("limit", 0))
+            if len(first_page) < (min(count, query_limit) if query_limit else count):
+                # Only the remaining pages are fetched, starting after the first page.
+                # The multiquery may have replaced a rejected token, so the current
+                # one is read here.
+                futures[executor.submit(pipeline.api_fetch, url, client_id, pipeline.auth["access_token"], query, 
+                                        first_page, count)] = table_id
+            else:
+                completed.append((table_id, pd.DataFrame.from_records(first_page, columns=field_order(query))))
+        # Submit all paginated fetches before handing out the finished tables
+        for table_id, frame in completed:
+            yield table_id, typed_data(pipeline, table_id, frame)
+        for future in as_completed(futures):
+            yield futures[future], typed_data(pipeline, futures[future], future.result())
+
 def save_everything_locally(pipeline: Pipeline, client_id: str) -> None:
-    with open("value_config.yml", "r") as f:
-        config = yaml.safe_load(f)
+    config = load_config()
     urls = config.get("urls", [])
     queries = config.get("queries", [])
     dataset_id = config.get("bq_dataset_id", "")
@@ -259,19 +1098,23 @@ def save_everything_locally(pipeline: Pipeline, client_id: str) -> None:
 
     # Fetch data from the IGDB API.
     # Loop over URLs, queries, and table IDs in value_config.yml.
-    for url, query, table_id in zip(urls, queries, table_ids):
-        data = Data(pipeline.api_fetch(url, client_id, pipeline.auth["access_token"], query))
+    for table_id, data in fetch_tables(pipeline, client_id, urls, queries, table_ids):
         if data:
-            data.save_to_json(f"{dataset_id}/{table_id}.json")
+            data.save_to_parquet(f"{dataset_id}/{table_id}.parquet")
 
 def save_one_table_locally(pipeline: Pipeline, client_id: str, url: str, query: str, table_id: str) -> None:
-    data = Data(pipeline.api_fetch(url, client_id, pipeline.auth["access_token"], query))
+    data = typed_data(pipeline, table_id, pipeline.api_fetch(url, client_id, pipeline.auth["access_token"], query))
     if data:
-        data.save_to_json(f"raw_data/{table_id}.json")
+        data.save_to_parquet(f"raw_data/{table_id}.parquet")
+
+def save_one_table_raw_locally(pipeline: Pipeline, client_id: str, url: str, query: str, table_id: str) -> None:
+    pipeline.api_fetch_ndjson(url, client_id, pipeline.auth["access_token"], query, f"raw_data/{table_id}.ndjson")
 
 def upload_local_to_bigquery(pipeline: Pipeline, table_ids: list[str] | None = None) -> None:
     """
-    Uploads local JSON files to BigQuery.
+    Uploads local files to BigQuery. Tables can be saved as Parquet, raw 
+    newline-delimited JSON, or JSON from before the switch to Parquet, and the
+    most recently saved file of each table is uploaded.
     If table_ids is not provided, it will be read from the environment variable.
 
     Args:
@@ -279,12 +1122,35 @@ def upload_local_to_bigquery(pipeline: Pipeline, table_ids: list[str] | None = N
         table_ids (list[str] | None): Optional list of BigQuery table IDs.
     """
     if not table_ids:
-        table_ids = os.getenv("BQ_TABLE_IDS", "").split(",")
+        table_ids = env_table_ids()
+    # Start every load job before waiting on any, so they run concurrently in BigQuery
+    jobs = []
     for table_id in table_ids:
-        data = Data()
-        data.load_from_json(f"raw_data/{table_id}.json")
-        if data and data.records > 0:
-            pipeline.upload_to_bigquery(data, dataset_id="raw_data", table_id=table_id)
+        # A file left over from an earlier save in another format may exist as well
+        file_paths = [f"raw_data/{table_id}{extension}" for extension in (".parquet", ".ndjson", ".json")]
+        file_paths = [file_path for file_path in file_paths if os.path.exists(file_path)]
+        if not file_paths:
+            raise FileNotFoundError(f"No local file found for table {table_id}")
+        file_path = max(file_paths, key=os.path.getmtime)
+        if file_path.endswith(".parquet"):
+            # Only the footer is read to check for records
+            if pq.ParquetFile(file_path).metadata.num_rows > 0:
+                jobs.append(pipeline.upload_to_bigquery(file_path, dataset_id="raw_data", table_id=table_id, 
+                                                        wait=False))
+        elif file_path.endswith(".ndjson"):
+            if os.path.getsize(file_path) > 0:
+                jobs.append(pipeline.upload_ndjson_to_bigquery(file_path, dataset_id="raw_data", 
+                                                               table_id=table_id, wait=False))
+        else:
+            # The local files are already JSON, so upload the records as they are
+            # instead of building a DataFrame from them.
+            with open(file_path, "rb") as f:
+                records = orjson.loads(f.read())
+            if records:
+                jobs.append(pipeline.upload_json_to_bigquery(records, dataset_id="raw_data", table_id=table_id, 
+                                                             wait=False))
+    for job in jobs:
+        pipeline.wait_for_upload(job)
 
 def upload_api_to_bigquery(pipeline: Pipeline, client_id: str, urls: list[str] | None = None, 
                            querys: list[str] | None = None, dataset_id: str | None = None, 
@@ -303,22 +1169,19 @@ def upload_api_to_bigquery(pipeline: Pipeline, client_id: str, urls: list[str] |
         table_ids (list[str] | None): Optional list of BigQuery table IDs.
     """
     if not (urls and querys and dataset_id and table_ids):
-        with open("value_config.yml", "r") as f:
-            config = yaml.safe_load(f)
+        config = load_config()
         urls = config.get("urls", [])
-        queries = config.get("queries", [])
+        querys = config.get("queries", [])
         dataset_id = config.get("bq_dataset_id", "")    
         table_ids = config.get("bq_table_ids", [])
 
-        for url, query, table_id in zip(urls, queries, table_ids):
-            data = Data(pipeline.api_fetch(url, client_id, pipeline.auth["access_token"], query))
-            if data and data.records > 0:
-                pipeline.upload_to_bigquery(data, dataset_id=dataset_id, table_id=table_id)
-    else:
-        for url, query, table_id in zip(urls, querys, table_ids):
-            data = Data(pipeline.api_fetch(url, client_id, pipeline.auth["access_token"], query))
-            if data and data.records > 0:
-                pipeline.upload_to_bigquery(data, dataset_id=dataset_id, table_id=table_id)
+    # Start every load job before waiting on any, so they run concurrently in BigQuery
+    jobs = []
+    for table_id, data in fetch_tables(pipeline, client_id, urls, querys, table_ids):
+        if data:
+            jobs.append(pipeline.upload_to_bigquery(data, dataset_id=dataset_id, table_id=table_id, wait=False))
+    for job in jobs:
+        pipeline.wait_for_upload(job)
 
 
 def main() -> int:
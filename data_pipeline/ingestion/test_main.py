@@ -0,0 +1,216 @@
+import os
+import re
+
+import httpx
+import pandas as pd
+import pytest
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import bigquery
+
+import main
+from main import (MAX_OPEN_REQUESTS, MAX_RETRIES, RETRY_BACKOFF, ROW_INTERVAL, Data, Pipeline, fetch_tables, 
+                  field_order, parse_query, upload_local_to_bigquery)
+
+
+@pytest.fixture
+def make_pipeline(monkeypatch, tmp_path):
+    # Schemas are read relative to the working directory, as in the container
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    def make(handler=None) -> Pipeline:
+        client = bigquery.Client(project="test", credentials=AnonymousCredentials())
+        pipeline = Pipeline(client=client, transport=httpx.MockTransport(handler) if handler else None)
+        pipeline.TOKEN_CACHE_PATH = str(tmp_path / "igdb_token.json")
+        return pipeline
+
+    return make
+
+
+def fake_igdb(sent_tokens: list[str], counts: dict[str, int]):
+    """
+    Mocks Twitch, which hands out the "new" token, and the IGDB endpoints in
+    `counts`, which reject any other token. Records have ids 1 to the count.
+    """
+    def records(endpoint: str, body: str) -> list[dict]:
+        query = parse_query(body)
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 10))
+        return [{"id": i + 1} for i in range(offset, min(offset + limit, counts[endpoint]))]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "id.twitch.tv":
+            return httpx.Response(200, json={"access_token": "new", "expires_in": 3600})
+        sent_tokens.append(request.headers["Authorization"])
+        if request.headers["Authorization"] != "Bearer new":
+            return httpx.Response(401)
+        body = request.content.decode()
+        endpoint = request.url.path.split("/")[2]
+        if endpoint == "multiquery":
+            results = []
+            for target, name, sub_query in re.findall(r'query (\S+) "([^"]+)" \{ (.*?) \};', body):
+                if target.endswith("/count"):
+                    results.append({"name": name, "count": counts[target.split("/")[0]]})
+                else:
+                    results.append({"name": name, "result": records(target, sub_query)})
+            return httpx.Response(200, json=results)
+        if request.url.path.endswith("/count"):
+            return httpx.Response(200, json={"count": counts[endpoint]})
+        return httpx.Response(200, json=records(endpoint, body))
+
+    return handler
+
+
+def authenticate_with_revoked_token(pipeline: Pipeline) -> None:
+    pipeline._save_cached_token("client", {"access_token": "old", "expires_in": 3600})
+    pipeline.authenticate("client", "secret")
+    assert pipeline.auth["access_token"] == "old"
+
+
+def games_data(pipeline: Pipeline, records: list[dict]) -> Data:
+    dtypes = pipeline.column_dtypes("games")
+    data = Data(pd.DataFrame.from_records(records, columns=list(dtypes)))
+    data.coerce_dtypes(dtypes)
+    return data
+
+
+def test_coerce_dtypes_with_list_field_missing_from_every_record(make_pipeline):
+    pipeline = make_pipeline()
+    data = games_data(pipeline, [{"id": 1, "name": "a"}, {"id": 2, "hypes": 3}])
+    assert data.data.dtypes.to_dict() == pipeline.column_dtypes("games")
+    assert data.data["genres"].isna().all()
+
+
+def test_parquet_round_trip_and_append(make_pipeline, tmp_path):
+    pipeline = make_pipeline()
+    dtypes = pipeline.column_dtypes("games")
+    file_path = str(tmp_path / "games.parquet")
+    saved = games_data(pipeline, [{"id": 1, "name": "a", "genres": [1, 2], "total_rating": 5.5}, {"id": 2, "hypes": 3}])
+    saved.save_to_parquet(file_path)
+
+    loaded = Data()
+    loaded.load_from_parquet(file_path)
+    assert loaded.data.dtypes.to_dict() == dtypes
+    assert loaded.data["genres"].tolist()[0] == [1, 2]
+
+    games_data(pipeline, [{"id": 2}, {"id": 3, "genres": [4]}]).save_to_parquet(file_path, append=True)
+    loaded.load_from_parquet(file_path)
+    assert loaded.data["id"].tolist() == [1, 2, 3]
+    assert loaded.data.dtypes.to_dict() == dtypes
+
+
+def test_parquet_matches_schema_only_after_casting(make_pipeline, tmp_path):
+    pipeline = make_pipeline()
+    file_path = str(tmp_path / "games.parquet")
+    records = [{"id": 1, "name": "a", "genres": [1, 2]}, {"id": 2, "hypes": 3}]
+    Data(pd.DataFrame.from_records(records)).save_to_parquet(file_path)
+    assert not pipeline._parquet_matches_schema(file_path, "games")
+
+    games_data(pipeline, records).save_to_parquet(file_path)
+    assert pipeline._parquet_matches_schema(file_path, "games")
+
+
+def test_rejected_token_is_replaced_for_the_remaining_pages(make_pipeline):
+    sent_tokens = []
+    pipeline = make_pipeline(fake_igdb(sent_tokens, {"games": 2 * ROW_INTERVAL}))
+    authenticate_with_revoked_token(pipeline)
+
+    pages = list(pipeline._fetch_pages("https://api.igdb.com/v4/games", "client", "old", "fields name;"))
+    assert len(pages) == 2
+    # Only the first request is sent with the rejected token
+    assert sent_tokens == ["Bearer old"] + ["Bearer new"] * 3
+
+
+def test_fetch_tables_paginates_with_the_replaced_token(make_pipeline):
+    sent_tokens = []
+    pipeline = make_pipeline(fake_igdb(sent_tokens, {"games": 3 * ROW_INTERVAL, "genres": 5}))
+    authenticate_with_revoked_token(pipeline)
+
+    tables = dict(fetch_tables(pipeline, "client", ["https://api.igdb.com/v4/games", "https://api.igdb.com/v4/genres"], 
+                               ["fields name; sort id asc;", "fields name; sort id asc;"], ["games", "genres"]))
+    assert tables["games"].data["id"].tolist() == list(range(1, 3 * ROW_INTERVAL + 1))
+    assert tables["genres"].records == 5
+    # Only the multiquery is sent with the rejected token, and retried once
+    assert sent_tokens.count("Bearer old") == 1
+
+
+def test_fetch_tables_only_requests_the_remaining_pages(make_pipeline):
+    sent_tokens = []
+    pipeline = make_pipeline(fake_igdb(sent_tokens, {"games": 3 * ROW_INTERVAL, "genres": 5}))
+    pipeline.auth = {"access_token": "new"}
+    pipeline._set_session_headers("client")
+
+    tables = dict(fetch_tables(pipeline, "client", ["https://api.igdb.com/v4/games", "https://api.igdb.com/v4/genres"], 
+                               ["fields name; sort id asc; limit 1200;", "fields name; sort id asc;"], ["games", "genres"]))
+    assert tables["games"].data["id"].tolist() == list(range(1, 1201))
+    assert tables["genres"].records == 5
+    # One multiquery with the first pages and counts, then the second and third page of games
+    assert len(sent_tokens) == 3
+
+
+def test_post_raises_once_retries_run_out(make_pipeline, monkeypatch):
+    monkeypatch.setattr(main.time, "sleep", lambda seconds: None)
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        return httpx.Response(503, json={"message": "unavailable"})
+
+    pipeline = make_pipeline(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        pipeline._post("https://api.igdb.com/v4/games", content=b"fields name;")
+    assert len(attempts) == MAX_RETRIES + 1
+
+
+def test_transport_error_backoff_releases_the_request_slot(make_pipeline, monkeypatch):
+    pipeline = make_pipeline(lambda request: httpx.Response(200, json=[]))
+    free_slots_while_sleeping = []
+
+    def sleep(seconds: float) -> None:
+        # The rate limit also sleeps, only the backoff is checked
+        if seconds >= RETRY_BACKOFF:
+            free_slots_while_sleeping.append(pipeline._request_slots._value)
+
+    def post(url: str, **kwargs) -> httpx.Response:
+        if not free_slots_while_sleeping:
+            raise httpx.ConnectError("connection refused")
+        return original_post(url, **kwargs)
+
+    original_post = pipeline.session.post
+    monkeypatch.setattr(main.time, "sleep", sleep)
+    monkeypatch.setattr(pipeline.session, "post", post)
+    pipeline._post("https://api.igdb.com/v4/games", content=b"fields name;")
+    assert free_slots_while_sleeping == [MAX_OPEN_REQUESTS]
+
+
+def test_upload_local_to_bigquery_uploads_the_newest_file(make_pipeline, monkeypatch, tmp_path):
+    pipeline = make_pipeline()
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("raw_data")
+    Data(pd.DataFrame({"id": [1]})).save_to_parquet("raw_data/games.parquet")
+    with open("raw_data/games.ndjson", "wb") as f:
+        f.write(b'{"id": 2}\n')
+    os.utime("raw_data/games.parquet", (0, 0))
+    uploads = []
+    monkeypatch.setattr(pipeline, "upload_ndjson_to_bigquery", lambda file_path, **kwargs: uploads.append(file_path))
+    monkeypatch.setattr(pipeline, "upload_to_bigquery", lambda file_path, **kwargs: uploads.append(file_path))
+    monkeypatch.setattr(pipeline, "wait_for_upload", lambda job: None)
+
+    upload_local_to_bigquery(pipeline, ["games"])
+    assert uploads == ["raw_data/games.ndjson"]
+
+
+def test_parse_query_lowercases_only_the_keywords():
+    assert parse_query('Fields name; WHERE name = "Half-Life"; Sort id asc; LIMIT 5;') == {
+        "fields": "name", "where": 'name = "Half-Life"', "sort": "id asc", "limit": "5"}
+
+
+@pytest.mark.parametrize("query, columns", [
+    ("fields name, genres.name, genres.slug; sort id asc;", ["id", "name", "genres"]),
+    ("fields id, name, id;", ["id", "name"]),
+    ("FIELDS name;", ["id", "name"]),
+    ("fields *;", None),
+    ("fields name, genres.*;", ["id", "name", "genres"]),
+    ("sort id asc;", None),
+])
+def test_field_order(query, columns):
+    assert field_order(query) == columns
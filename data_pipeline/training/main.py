@@ -1,36 +1,94 @@
+import functools
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
+from google.cloud import bigquery_storage
+import pyarrow as pa
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # Render headlessly, the pipeline never opens a window
 import matplotlib.pyplot as plt
 import os
 from dotenv import load_dotenv
 import logging
 import yaml
+from requests.adapters import HTTPAdapter
+
+# Parse YAML with libyaml's C loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# Clients are created once per process and shared, so credential discovery
+# and connection setup only happen once.
+@functools.lru_cache(maxsize=1)
+def get_bq_client() -> bigquery.Client:
+    credentials, project = google.auth.default(scopes=bigquery.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+    return bigquery.Client(project=project, credentials=credentials, _http=session)
+
+
+@functools.lru_cache(maxsize=1)
+def get_bqstorage_client() -> bigquery_storage.BigQueryReadClient:
+    return bigquery_storage.BigQueryReadClient()
 
 
 class MLModel:
     def __init__(self, dataset_id: str, view_id: str) -> None:
         logging.info("Initializing ML model")
         try:
-            self.client = bigquery.Client()
+            self.client = get_bq_client()
+            self.bqstorage_client = get_bqstorage_client()
             self.dataset_id = dataset_id
             self.view_id = view_id
-            self.data = pd.DataFrame(columns=["genre", "release_year", "release_month", "rating"])
+            self.columns = ["genre", "release_year", "release_month", "rating"]
+            # Narrow dtypes to cut the memory of the frame several times over
+            self.dtypes = {"genre": "category", "release_year": "Int16", "release_month": "Int8", "rating": "float32"}
+            # Fetched data is kept as an Arrow table and only converted to
+            # pandas when `data` is read.
+            self.table: pa.Table | None = None
+            self._data = None
             logging.info(f"BigQuery Client initialized for dataset: {self.dataset_id}, view: {self.view_id}")
         except Exception as e:
             logging.error(f"Error initializing ML model: {e}")
             raise
 
-    def fetch_data(self) -> None:
+    @property
+    def data(self) -> pd.DataFrame:
+        if self._data is None:
+            if self.table is None or self.table.num_rows == 0:
+                df = pd.DataFrame(columns=self.columns)
+            else:
+                df = self.table.to_pandas()
+            self._data = df.astype({column: dtype for column, dtype in self.dtypes.items() if column in df.columns})
+        return self._data
+
+    def fetch_data(self, limit: int | None = None) -> None:
         logging.info("Fetching data from BigQuery")
         try:
+            # Aggregate and sort in BigQuery so only the monthly averages per
+            # genre are downloaded, already free of duplicates.
             query = f"""
-            SELECT *
+            SELECT genre, release_year, release_month, AVG(rating) AS rating
             FROM `{self.dataset_id}.{self.view_id}`
+            GROUP BY genre, release_year, release_month
+            ORDER BY genre, release_year, release_month
             """
-            query_job = self.client.query(query)
+            query_parameters = []
+            if limit is not None:
+                query += "LIMIT @limit"
+                query_parameters.append(bigquery.ScalarQueryParameter("limit", "INT64", limit))
+            job_config = bigquery.QueryJobConfig(query_parameters=query_parameters)
+            query_job = self.client.query(query, job_config=job_config)
             results = query_job.result()
-            df = results.to_dataframe()
-            self.data = pd.concat([self.data, df]).drop_duplicates()
+            # Download through the BigQuery Storage API and decode via Arrow
+            # instead of paging JSON rows over the REST API. The Storage API
+            # streams already buffer batches ahead of the reader.
+            # Each fetch is a complete snapshot of the aggregates, so it replaces
+            # the previous one instead of being merged into it.
+            self.table = results.to_arrow(bqstorage_client=self.bqstorage_client)
+            self._data = None
             logging.info("Data fetched successfully")
         except Exception as e:
             logging.error(f"Error fetching data: {e}")
@@ -42,12 +100,16 @@ class MLModel:
             logging.warning("No data available for visualization")
             return
         try:
-            plt.figure(figsize=(10, 6))
-            plt.hist(self.data.iloc[:, 0], bins=30, alpha=0.7)
+            values = self.data["rating"].to_numpy(dtype=np.float64)
+            values = values[~np.isnan(values)]
+            counts, edges = np.histogram(values, bins=30)
+            fig = plt.figure(figsize=(10, 6))
+            plt.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.7)
             plt.title('Data Distribution')
-            plt.xlabel('Value')
+            plt.xlabel('Rating')
             plt.ylabel('Frequency')
-            plt.show()
+            fig.savefig("distribution.png", dpi=100)
+            plt.close(fig)
             logging.info("Data visualization completed successfully")
         except Exception as e:
             logging.error(f"Error during data visualization: {e}")
@@ -71,14 +133,24 @@ class MLModel:
             if self.data.empty:
                 logging.warning("No data available in the model")
                 return
+            df_filter = self.data["genre"].isin(genres)
+            if year is not None:
+                # Rows with a NULL year compare as NA, which can't be used in a mask
+                df_filter &= (self.data["release_year"] == year).fillna(False)
+            # Rows without a release year or month have no place on the date axis
+            df_filter &= self.data["release_year"].notna() & self.data["release_month"].notna()
+            df = self.data[df_filter]
+            if df.empty:
+                logging.warning("No data available for the selected genres")
+                return
+            # Build the date axis once and let pandas emit one line per genre column
+            dates = pd.to_datetime(pd.DataFrame({"year": df["release_year"],
+                                                 "month": df["release_month"],
+                                                 "day": 1}))
+            # Rows are unique per genre and month, so a plain pivot suffices
+            ratings = df.assign(date=dates).pivot(index="date", columns="genre", values="rating")
             fig, ax = plt.subplots()
-            for genre in genres:
-                df_filter = self.data["genre"] == genre
-                if year is not None:
-                    df_filter *= self.data["release_year"] == year
-                df = self.data[df_filter]
-                ax.plot([f"{year}/{month}" for year, month in zip(df["release_year"], df["release_month"])],
-                        df["rating"], label=genre)
+            ratings.reindex(columns=genres).plot(ax=ax)
             ax.set_title(f"Average monthly rating of game genres in {year}")
             ax.set_ylabel("Average rating (0-100)")
             ax.set_xlabel("Year/month")
@@ -86,6 +158,7 @@ class MLModel:
             ax.set_ylim(0, 100)
             ax.legend()
             fig.savefig("graph.png")
+            plt.close(fig)
         except Exception as e:
             logging.error(f"Error during prediction: {e}")
             raise
@@ -97,7 +170,7 @@ def main():
     logging.info("Starting ML Model Training Pipeline")
 
     with open("value_config.yml", "r") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=YAML_LOADER)
     dataset_id = config.get("dataset_id")
     view_id = config.get("view_id")
 